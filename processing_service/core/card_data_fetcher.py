@@ -1,13 +1,47 @@
 import redis
 import requests
 import json
+import threading
 from shared.config import get_settings
 
-settings = get_settings()
-
 class CardDataFetcher:
     def __init__(self) -> None:
+        settings = get_settings()
+        self.api_url = settings.lorcana_api_url
         self.redis_client = redis.Redis(host=settings.redis_host, port=settings.redis_port, db=0)
+        # Per-thread sessions, as requests.Session is not guaranteed thread-safe
+        self._local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        Returns the calling thread's keep-alive session, so repeated API calls
+        from that thread reuse the same connection.
+        """
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def get_cached_card_details(self, card_names: list[str]) -> dict[str, dict]:
+        """
+        Fetches the cached details of several cards in a single Redis round trip.
+        Cards that are not cached are left out of the result.
+        """
+        if not card_names:
+            return {}
+
+        try:
+            cached_values = self.redis_client.mget(card_names)
+        except redis.exceptions.RedisError as e:
+            print(f"Redis error: {e}")
+            return {}
+
+        return {
+            card_name: json.loads(cached_data)
+            for card_name, cached_data in zip(card_names, cached_values)
+            if cached_data
+        }
 
     def get_card_details(self, card_name: str) -> dict:
         """
@@ -22,13 +56,21 @@ class CardDataFetcher:
             # Fallback to API if Redis fails
             pass
 
+        return self.fetch_card_details(card_name)
+
+    def fetch_card_details(self, card_name: str) -> dict:
+        """
+        Fetches card details from the Lorcana API and caches them, without
+        checking the cache first.
+        """
         try:
-            response = requests.get(f"{settings.lorcana_api_url}/cards/{card_name}")
+            response = self.session.get(f"{self.api_url}/cards/{card_name}")
             response.raise_for_status()
             card_details = response.json()
             if response.status_code == 200 and card_details:
                 try:
-                    self.redis_client.set(card_name, json.dumps(card_details))
+                    # Cache the response body as received instead of re-serializing it
+                    self.redis_client.set(card_name, response.content)
                 except redis.exceptions.RedisError as e:
                     print(f"Redis error: {e}")
             return card_details
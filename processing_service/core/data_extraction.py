@@ -1,22 +1,44 @@
 from .card_data_fetcher import CardDataFetcher
 
 import re
+from functools import lru_cache
+
+# Potential card names are runs of capital letters and whitespace
+CARD_NAME_PATTERN = re.compile(r'\b[A-Z\s]+\b')
+
+@lru_cache(maxsize=1)
+def get_card_fetcher() -> CardDataFetcher:
+    """
+    Returns the CardDataFetcher shared by every extraction in this process,
+    so its Redis connection pool is created once rather than per task.
+    """
+    return CardDataFetcher()
 
 def extract_data(card_texts: list[str]) -> list[dict]:
     """
     Extracts card names from OCR text and fetches their details.
+    The cache is queried for every candidate name at once, names it misses
+    go straight to the API, and names that appear in several texts are only
+    looked up once.
     """
-    card_fetcher = CardDataFetcher()
-    card_details = []
+    card_fetcher = get_card_fetcher()
+
+    # Use regex to find potential card names (e.g., all-caps words)
+    names_per_text = []
     for card_text in card_texts:
-        # Use regex to find potential card names (e.g., all-caps words)
-        potential_names = re.findall(r'\b[A-Z\s]+\b', card_text)
-        for name in potential_names:
-            card_name = name.strip()
-            if card_name:
-                details = card_fetcher.get_card_details(card_name)
-                if details:
-                    card_details.append(details)
-                    # Assuming the first match is the correct one
-                    break
+        potential_names = (name.strip() for name in CARD_NAME_PATTERN.findall(card_text))
+        names_per_text.append([card_name for card_name in potential_names if card_name])
+    candidate_names = list(dict.fromkeys(name for names in names_per_text for name in names))
+    known_details = card_fetcher.get_cached_card_details(candidate_names)
+
+    card_details = []
+    for names in names_per_text:
+        for card_name in names:
+            if card_name not in known_details:
+                known_details[card_name] = card_fetcher.fetch_card_details(card_name)
+            details = known_details[card_name]
+            if details:
+                card_details.append(details)
+                # Assuming the first match is the correct one
+                break
     return card_details
@@ -1,19 +1,141 @@
 import cv2
 import numpy as np
 import pytesseract
-from PIL import Image
-import io
+import hashlib
+import math
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from shared.config import get_settings
+
+# Number of card images handed to a single Tesseract process.
+OCR_BATCH_SIZE = 32
+
+# Number of threads, and so of concurrent Tesseract processes, used for one
+# image. Celery already runs a worker process per core, so this stays small.
+OCR_WORKERS = 2
+
+# Card images smaller than this, or flatter than this standard deviation,
+# cannot contain legible text and are not sent to Tesseract.
+MIN_OCR_SIZE = 16
+MIN_OCR_STDDEV = 5.0
+
+# Card images are downscaled so their longest side is at most this many
+# pixels before OCR, roughly 400 DPI for a standard 3.5 inch card.
+MAX_OCR_DIMENSION = 1500
+
+# Images whose estimated noise standard deviation is below this are already
+# clean enough for segmentation and skip the non-local means denoise.
+MIN_DENOISE_SIGMA = 2.0
+
+# Laplacian-difference kernel used for Immerkaer's fast noise estimate.
+NOISE_ESTIMATION_KERNEL = np.array([[1, -2, 1], [-2, 4, -2], [1, -2, 1]], dtype=np.float32)
+
+# Filter strength and window sizes for non-local means denoising.
+DENOISE_STRENGTH = 10.0
+DENOISE_TEMPLATE_WINDOW = 7
+DENOISE_SEARCH_WINDOW = 21
+
+# Neighbourhood diameter and sigmas for the cheaper bilateral denoise.
+BILATERAL_DIAMETER = 9
+BILATERAL_SIGMA_COLOR = 75.0
+BILATERAL_SIGMA_SPACE = 75.0
+
+@lru_cache(maxsize=1)
+def cuda_available() -> bool:
+    """
+    Checks whether OpenCV was built with CUDA and can see a device.
+    The check runs on first use rather than at import, so CUDA is initialised
+    in the Celery worker process that uses it and not in the parent before fork.
+    """
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except (AttributeError, cv2.error):
+        return False
 
 def preprocess_image(image_bytes: bytes) -> np.ndarray:
     """
     Preprocesses the image for OCR.
     """
-    image = Image.open(io.BytesIO(image_bytes))
-    image_np = np.array(image)
-    gray = cv2.cvtColor(image_np, cv2.COLOR_BGR2GRAY)
-    denoised = cv2.fastNlMeansDenoising(gray, None, 10, 7, 21)
+    # Decode straight to grayscale from the in-memory bytes, skipping the
+    # EXIF orientation lookup so uploads are processed as stored
+    gray = cv2.imdecode(
+        np.frombuffer(image_bytes, dtype=np.uint8),
+        cv2.IMREAD_GRAYSCALE | cv2.IMREAD_IGNORE_ORIENTATION,
+    )
+    if gray is None:
+        raise ValueError("Could not decode image bytes")
+    settings = get_settings()
+    denoised = reduce_noise(gray, scale=settings.denoise_scale, method=settings.denoise_method)
     return denoised
 
+def estimate_noise(gray: np.ndarray) -> float:
+    """
+    Estimates the standard deviation of Gaussian noise in a grayscale image
+    using Immerkaer's method.
+    """
+    height, width = gray.shape[:2]
+    if height < 3 or width < 3:
+        # No pixel has a full 3x3 neighbourhood to estimate from
+        return 0.0
+    response = cv2.filter2D(gray, cv2.CV_32F, NOISE_ESTIMATION_KERNEL)
+    # cv2.norm sums the absolute values in one pass without a NumPy temporary
+    total = cv2.norm(response[1:-1, 1:-1], cv2.NORM_L1)
+    return math.sqrt(math.pi / 2) * total / (6 * (height - 2) * (width - 2))
+
+def reduce_noise(gray: np.ndarray, scale: float = 1.0, method: str = "nlm") -> np.ndarray:
+    """
+    Removes noise from a grayscale image with non-local means denoising.
+    Runs on the GPU when OpenCV has a CUDA device, otherwise on the CPU.
+    Images that are already clean are returned unchanged.
+
+    A scale below 1.0 denoises a downscaled copy and resizes the result back
+    to the original size. Denoising cost falls with the square of the scale
+    at the expense of fine detail, so the default keeps full resolution.
+    The scale must be greater than 0 and at most 1.
+
+    Passing method="bilateral" uses an edge-preserving bilateral filter
+    instead, which is much cheaper but removes less noise from flat regions.
+    preprocess_image takes both options from the DENOISE_SCALE and
+    DENOISE_METHOD settings.
+    """
+    if method not in ("nlm", "bilateral"):
+        raise ValueError(f"Unknown denoising method: {method}")
+    if not 0 < scale <= 1:
+        raise ValueError(f"Denoising scale must be in (0, 1]: {scale}")
+
+    if estimate_noise(gray) < MIN_DENOISE_SIGMA:
+        return gray
+
+    if scale < 1.0:
+        height, width = gray.shape[:2]
+        # Keep at least one pixel per side so very small scales stay valid
+        small_size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        small = cv2.resize(gray, small_size, interpolation=cv2.INTER_AREA)
+        denoised = _denoise(small, method)
+        return cv2.resize(denoised, (width, height), interpolation=cv2.INTER_LINEAR)
+
+    return _denoise(gray, method)
+
+def _denoise(gray: np.ndarray, method: str) -> np.ndarray:
+    if method == "bilateral":
+        return cv2.bilateralFilter(gray, BILATERAL_DIAMETER, BILATERAL_SIGMA_COLOR, BILATERAL_SIGMA_SPACE)
+
+    if cuda_available():
+        try:
+            gpu_gray = cv2.cuda_GpuMat()
+            gpu_gray.upload(gray)
+            gpu_denoised = cv2.cuda.fastNlMeansDenoising(
+                gpu_gray, DENOISE_STRENGTH, search_window=DENOISE_SEARCH_WINDOW, block_size=DENOISE_TEMPLATE_WINDOW
+            )
+            return gpu_denoised.download()
+        except cv2.error:
+            # Fall back to the CPU implementation if the CUDA call fails
+            pass
+
+    return cv2.fastNlMeansDenoising(gray, None, DENOISE_STRENGTH, DENOISE_TEMPLATE_WINDOW, DENOISE_SEARCH_WINDOW)
+
 def segment_cards(image: np.ndarray) -> list[np.ndarray]:
     """
     Segments the image to find individual cards using Canny edge detection.
@@ -27,6 +149,11 @@ def segment_cards(image: np.ndarray) -> list[np.ndarray]:
     # Filter contours based on area and aspect ratio
     card_images = []
     for contour in contours:
+        # Discard small contours before the more expensive polygon approximation
+        area = cv2.contourArea(contour)
+        if area <= 1000:
+            continue
+
         # Approximate the contour to a polygon
         perimeter = cv2.arcLength(contour, True)
         approx = cv2.approxPolyDP(contour, 0.02 * perimeter, True)
@@ -36,19 +163,18 @@ def segment_cards(image: np.ndarray) -> list[np.ndarray]:
             # Get the bounding box of the contour
             x, y, w, h = cv2.boundingRect(approx)
 
-            # Filter based on aspect ratio and area to identify cards
+            # Filter based on aspect ratio to identify cards
             aspect_ratio = w / float(h)
-            area = cv2.contourArea(contour)
-            if 0.5 < aspect_ratio < 1.5 and area > 1000:
+            if 0.5 < aspect_ratio < 1.5:
                 # Crop the card from the original image
                 card_image = image[y : y + h, x : x + w]
                 card_images.append(card_image)
 
     return card_images
 
-def ocr_card(card_image: np.ndarray) -> str:
+def binarize_card(card_image: np.ndarray) -> np.ndarray:
     """
-    Performs OCR on a card image to extract text.
+    Converts a card image to a black and white image suitable for OCR.
     """
     # Convert to grayscale if the image is not already
     if len(card_image.shape) == 3:
@@ -56,12 +182,99 @@ def ocr_card(card_image: np.ndarray) -> str:
     else:
         gray = card_image
 
+    # Tesseract's runtime grows with pixel count, so shrink oversized cards
+    longest_side = max(gray.shape[:2])
+    if longest_side > MAX_OCR_DIMENSION:
+        scale = MAX_OCR_DIMENSION / longest_side
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
     # Apply thresholding to binarize the image
     _, thresh = cv2.threshold(gray, 128, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    return thresh
+
+def has_text_signal(card_image: np.ndarray) -> bool:
+    """
+    Checks whether a card image is large and varied enough to hold text.
+    """
+    height, width = card_image.shape[:2]
+    if height < MIN_OCR_SIZE or width < MIN_OCR_SIZE:
+        return False
+    # cv2.meanStdDev works in a single pass without NumPy's float64 temporaries
+    _, stddev = cv2.meanStdDev(card_image)
+    return stddev.max() >= MIN_OCR_STDDEV
+
+def image_digest(image: np.ndarray) -> bytes:
+    """
+    Returns a content hash identifying an image by its shape and pixels.
+    """
+    digest = hashlib.blake2b(str(image.shape).encode(), digest_size=16)
+    digest.update(np.ascontiguousarray(image).data)
+    return digest.digest()
+
+def ocr_cards(card_images: list[np.ndarray]) -> list[str]:
+    """
+    Performs OCR on several card images. The cards are binarized and then
+    split into batches of OCR_BATCH_SIZE images per Tesseract process, with
+    both stages running in parallel on up to OCR_WORKERS threads.
+    Images without any text signal are skipped and yield an empty string,
+    and cards that binarize to identical images are only recognised once.
+    """
+    card_texts = [""] * len(card_images)
+    ocr_indices = [index for index, card_image in enumerate(card_images) if has_text_signal(card_image)]
+    if not ocr_indices:
+        return card_texts
 
-    # Perform OCR on the processed image
-    text = pytesseract.image_to_string(thresh)
-    return text
+    with ThreadPoolExecutor(max_workers=min(OCR_WORKERS, len(ocr_indices))) as executor:
+        # OpenCV releases the GIL, so the cards are binarized in parallel
+        binarized = executor.map(binarize_card, [card_images[index] for index in ocr_indices])
+
+        # Group the cards by the content of their binarized image
+        indices_by_digest: dict[bytes, list[int]] = {}
+        binary_images: dict[bytes, np.ndarray] = {}
+        for index, binary_image in zip(ocr_indices, binarized):
+            digest = image_digest(binary_image)
+            if digest not in indices_by_digest:
+                indices_by_digest[digest] = []
+                binary_images[digest] = binary_image
+            indices_by_digest[digest].append(index)
+
+        digests = list(indices_by_digest)
+        batches = [digests[start : start + OCR_BATCH_SIZE] for start in range(0, len(digests), OCR_BATCH_SIZE)]
+        batch_results = executor.map(
+            lambda batch_digests: _ocr_batch([binary_images[digest] for digest in batch_digests]),
+            batches,
+        )
+        for batch_digests, batch_texts in zip(batches, batch_results):
+            for digest, text in zip(batch_digests, batch_texts):
+                for index in indices_by_digest[digest]:
+                    card_texts[index] = text
+    return card_texts
+
+def _ocr_batch(binary_images: list[np.ndarray]) -> list[str]:
+    """
+    Runs Tesseract once over a list file of binarized card images.
+    Tesseract treats each listed image as a page and terminates every page
+    with a form feed, which is used to split the output back per card.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        image_paths = []
+        for index, binary_image in enumerate(binary_images):
+            image_path = os.path.join(tmp_dir, f"card_{index}.png")
+            # The files only live until Tesseract has read them, so favour encode speed
+            cv2.imwrite(image_path, binary_image, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+            image_paths.append(image_path)
+
+        list_path = os.path.join(tmp_dir, "cards.txt")
+        with open(list_path, "w") as list_file:
+            list_file.write("\n".join(image_paths) + "\n")
+
+        text = pytesseract.image_to_string(list_path)
+
+    pages = text.split("\f")
+    if len(pages) < len(binary_images):
+        # Texts can no longer be matched to their cards once a page is missing
+        raise RuntimeError(f"Tesseract returned {len(pages)} pages for {len(binary_images)} images")
+    return pages[: len(binary_images)]
 
 def process_image(image_bytes: bytes) -> list[str]:
     """
@@ -71,9 +284,4 @@ def process_image(image_bytes: bytes) -> list[str]:
     preprocessed_image = preprocess_image(image_bytes)
     card_images = segment_cards(preprocessed_image)
 
-    card_texts = []
-    for card_image in card_images:
-        text = ocr_card(card_image)
-        card_texts.append(text)
-
-    return card_texts
+    return ocr_cards(card_images)
@@ -1,3 +1,4 @@
+import threading
 import unittest
 from unittest.mock import patch, MagicMock
 import requests
@@ -8,15 +9,20 @@ class TestCardDataFetcher(unittest.TestCase):
     @patch('redis.Redis')
     @patch('processing_service.core.card_data_fetcher.get_settings')
     def setUp(self, mock_get_settings, mock_redis):
+        # Sessions are created on first use, so keep requests.Session patched
+        session_patcher = patch('requests.Session')
+        mock_session = session_patcher.start()
+        self.addCleanup(session_patcher.stop)
         mock_settings = MagicMock()
         mock_settings.redis_host = "localhost"
         mock_settings.redis_port = 6379
         mock_get_settings.return_value = mock_settings
         self.mock_redis_instance = mock_redis.return_value
+        self.mock_session_instance = mock_session.return_value
         self.fetcher = CardDataFetcher()
 
-    @patch('requests.get')
-    def test_fetch_card_data_from_api_success(self, mock_get):
+    def test_fetch_card_data_from_api_success(self):
+        mock_get = self.mock_session_instance.get
         self.mock_redis_instance.get.return_value = None
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -29,8 +35,8 @@ class TestCardDataFetcher(unittest.TestCase):
         self.assertEqual(result, {"Data": [{"CardName": "Test Card"}]})
         self.mock_redis_instance.set.assert_called_once()
 
-    @patch('requests.get')
-    def test_fetch_card_data_from_api_failure(self, mock_get):
+    def test_fetch_card_data_from_api_failure(self):
+        mock_get = self.mock_session_instance.get
         self.mock_redis_instance.get.return_value = None
         mock_response = MagicMock()
         mock_response.status_code = 404
@@ -52,5 +58,37 @@ class TestCardDataFetcher(unittest.TestCase):
         self.assertEqual(result, {"CardName": "Cached Card"})
         self.mock_redis_instance.get.assert_called_once_with(card_name)
 
+    def test_fetch_card_details_skips_cache_read(self):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"CardName": "New Card"}
+        self.mock_session_instance.get.return_value = mock_response
+
+        result = self.fetcher.fetch_card_details("New Card")
+
+        self.assertEqual(result, {"CardName": "New Card"})
+        self.mock_redis_instance.get.assert_not_called()
+        self.mock_redis_instance.set.assert_called_once()
+
+    @patch('requests.Session', side_effect=lambda: MagicMock())
+    def test_session_is_reused_within_a_thread_only(self, mock_session):
+        session = self.fetcher.session
+        other_sessions = []
+        thread = threading.Thread(target=lambda: other_sessions.append(self.fetcher.session))
+        thread.start()
+        thread.join()
+
+        self.assertIs(self.fetcher.session, session)
+        self.assertIsNot(other_sessions[0], session)
+        self.assertEqual(mock_session.call_count, 2)
+
+    def test_get_cached_card_details_uses_single_round_trip(self):
+        self.mock_redis_instance.mget.return_value = [b'{"CardName": "First Card"}', None]
+
+        result = self.fetcher.get_cached_card_details(["First Card", "Missing Card"])
+
+        self.assertEqual(result, {"First Card": {"CardName": "First Card"}})
+        self.mock_redis_instance.mget.assert_called_once_with(["First Card", "Missing Card"])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,25 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from processing_service.core.data_extraction import extract_data
+
+class TestDataExtraction(unittest.TestCase):
+
+    @patch('processing_service.core.data_extraction.get_card_fetcher')
+    def test_extract_data_looks_up_each_name_once(self, mock_get_card_fetcher):
+        fetcher = MagicMock()
+        fetcher.get_cached_card_details.return_value = {"CACHED CARD": {"CardName": "Cached Card"}}
+        fetcher.fetch_card_details.side_effect = lambda card_name: {"CardName": card_name.title()}
+        mock_get_card_fetcher.return_value = fetcher
+
+        result = extract_data(["CACHED CARD", "NEW CARD", "NEW CARD"])
+
+        self.assertEqual(
+            result,
+            [{"CardName": "Cached Card"}, {"CardName": "New Card"}, {"CardName": "New Card"}],
+        )
+        fetcher.get_cached_card_details.assert_called_once_with(["CACHED CARD", "NEW CARD"])
+        fetcher.fetch_card_details.assert_called_once_with("NEW CARD")
+        fetcher.get_card_details.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
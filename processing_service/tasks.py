@@ -1,11 +1,10 @@
-import hashlib
-from botocore.exceptions import ClientError
+from botocore.exceptions import BotoCoreError, ClientError
 from sqlalchemy.exc import SQLAlchemyError
 from .celery_app import celery_app
 from .core.image_processing import process_image
 from .core.data_extraction import extract_data
 from .utils.logging_utils import setup_logging
-from .utils.file_utils import download_image_from_s3, is_image_processed
+from .utils.file_utils import download_image_from_s3, get_image_hash, is_image_processed
 from .database import get_db, ProcessingJob, Card
 from shared.shared.models.models import ProcessedImage
 
@@ -37,10 +36,11 @@ def process_image_task(jobId: int, image_key: str) -> None:
     try:
         try:
             image_bytes = download_image_from_s3(image_key)
-        except ClientError as e:
+        except (ClientError, BotoCoreError) as e:
             raise ImageProcessingError(f"Error downloading image from S3: {e}")
 
-        if is_image_processed(image_bytes, db):
+        image_hash = get_image_hash(image_bytes)
+        if is_image_processed(image_hash, db):
             logger.info(f"Image in job {jobId} has already been processed. Skipping.")
             job.status = "COMPLETED"
             db.commit()
@@ -56,11 +56,8 @@ def process_image_task(jobId: int, image_key: str) -> None:
         except Exception as e:
             raise DataExtractionError(f"Error extracting data: {e}")
 
-        for card_data in card_details:
-            card = Card(job_id=jobId, content=str(card_data))
-            db.add(card)
+        db.add_all([Card(job_id=jobId, content=str(card_data)) for card_data in card_details])
 
-        image_hash = hashlib.sha256(image_bytes).hexdigest()
         processed_image = ProcessedImage(hash=image_hash)
         db.add(processed_image)
 
@@ -3,13 +3,16 @@ import numpy as np
 from PIL import Image
 import io
 import cv2
+from unittest.mock import patch, MagicMock
 
 from fuzzywuzzy import fuzz
 
 from processing_service.core.image_processing import (
     preprocess_image,
+    estimate_noise,
+    reduce_noise,
     segment_cards,
-    ocr_card,
+    ocr_cards,
 )
 
 
@@ -25,6 +28,69 @@ class TestCoreImageProcessing(unittest.TestCase):
         self.assertIsInstance(preprocessed_image, np.ndarray)
         self.assertEqual(len(preprocessed_image.shape), 2)  # Grayscale
 
+    def test_preprocess_image_rejects_invalid_bytes(self):
+        with self.assertRaises(ValueError):
+            preprocess_image(b"not an image")
+
+    @patch("processing_service.core.image_processing.reduce_noise")
+    @patch("processing_service.core.image_processing.get_settings")
+    def test_preprocess_image_uses_configured_denoise_options(self, mock_get_settings, mock_reduce_noise):
+        mock_settings = MagicMock()
+        mock_settings.denoise_scale = 0.5
+        mock_settings.denoise_method = "bilateral"
+        mock_get_settings.return_value = mock_settings
+        image_bytes = cv2.imencode(".png", np.zeros((20, 20), dtype=np.uint8))[1].tobytes()
+
+        preprocess_image(image_bytes)
+
+        self.assertEqual(mock_reduce_noise.call_args.kwargs["scale"], 0.5)
+        self.assertEqual(mock_reduce_noise.call_args.kwargs["method"], "bilateral")
+
+    def test_estimate_noise_handles_tiny_images(self):
+        image = np.zeros((2, 50), dtype=np.uint8)
+        self.assertEqual(estimate_noise(image), 0.0)
+
+    def test_reduce_noise_skips_clean_images(self):
+        image = np.full((100, 100), 200, dtype=np.uint8)
+        cv2.rectangle(image, (20, 20), (80, 80), 30, -1)
+        self.assertIs(reduce_noise(image), image)
+
+    def test_reduce_noise_denoises_noisy_images(self):
+        rng = np.random.default_rng(0)
+        image = np.clip(rng.normal(128, 10, (100, 100)), 0, 255).astype(np.uint8)
+        denoised = reduce_noise(image)
+        self.assertLess(denoised.std(), image.std())
+
+    def test_reduce_noise_scale_keeps_image_size(self):
+        rng = np.random.default_rng(0)
+        image = np.clip(rng.normal(128, 10, (101, 150)), 0, 255).astype(np.uint8)
+        denoised = reduce_noise(image, scale=0.5)
+        self.assertEqual(denoised.shape, image.shape)
+        self.assertLess(denoised.std(), image.std())
+
+    def test_reduce_noise_scale_keeps_tiny_sides(self):
+        rng = np.random.default_rng(0)
+        image = np.clip(rng.normal(128, 10, (5, 400)), 0, 255).astype(np.uint8)
+        denoised = reduce_noise(image, scale=0.05)
+        self.assertEqual(denoised.shape, image.shape)
+
+    def test_reduce_noise_rejects_invalid_scale(self):
+        image = np.zeros((10, 10), dtype=np.uint8)
+        for scale in (0, -0.5, 1.5):
+            with self.assertRaises(ValueError):
+                reduce_noise(image, scale=scale)
+
+    def test_reduce_noise_bilateral(self):
+        rng = np.random.default_rng(0)
+        image = np.clip(rng.normal(128, 10, (100, 100)), 0, 255).astype(np.uint8)
+        denoised = reduce_noise(image, method="bilateral")
+        self.assertLess(denoised.std(), image.std())
+
+    def test_reduce_noise_rejects_unknown_method(self):
+        image = np.zeros((10, 10), dtype=np.uint8)
+        with self.assertRaises(ValueError):
+            reduce_noise(image, method="median")
+
     def test_segment_cards(self):
         # Create a dummy image with a black rectangle on a white background
         image = np.full((200, 200), 255, dtype=np.uint8)
@@ -34,13 +100,13 @@ class TestCoreImageProcessing(unittest.TestCase):
         self.assertGreater(len(card_images), 0)
         self.assertIsInstance(card_images[0], np.ndarray)
 
-    def test_ocr_card(self):
+    def test_ocr_cards(self):
         # Load the test image
         image = Image.open("processing_service/test_image.png")
         # Convert the image to a numpy array
         image_np = np.array(image)
         # Perform OCR on the image
-        text = ocr_card(image_np)
+        text = ocr_cards([image_np])[0]
         # Check that the OCR text is correct
         self.assertGreater(fuzz.ratio(text.strip(), "Hello, World!"), 80)
 
@@ -4,7 +4,11 @@ from unittest.mock import patch, MagicMock
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
-from processing_service.tasks import process_image_task
+from botocore.exceptions import EndpointConnectionError
+from moto import mock_aws
+from processing_service.tasks import process_image_task, ImageProcessingError
+from processing_service.utils.file_utils import get_s3_client
+from processing_service.utils.test_file_utils import make_settings
 from shared.shared.models.models import ProcessingJob, ProcessedImage, Base
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
@@ -80,5 +84,56 @@ class TestImageProcessing(unittest.TestCase):
         # Verify that process_image and extract_data were not called
         # This requires more complex mocking of celery tasks or direct checks
 
+    @patch('processing_service.tasks.download_image_from_s3')
+    @patch('processing_service.tasks.get_db')
+    def test_process_image_storage_unreachable(self, mock_get_db, mock_download_image):
+        # Mocks
+        def mock_get_db_gen():
+            yield self.db
+        mock_get_db.return_value = mock_get_db_gen()
+        mock_download_image.side_effect = EndpointConnectionError(endpoint_url='http://minio:9000')
+
+        # Create a fake job
+        job = ProcessingJob(id=3, status='PENDING', s3_object_key='fake_key_down')
+        self.db.add(job)
+        self.db.commit()
+
+        # Execute the task
+        with self.assertRaises(ImageProcessingError):
+            process_image_task(3, 'fake_key_down')
+
+        # Assertions
+        updated_job = self.db.query(ProcessingJob).filter(ProcessingJob.id == 3).first()
+        self.assertEqual(updated_job.status, 'FAILED')
+        self.assertIn('Error downloading image from S3', updated_job.error_message)
+
+    @patch.dict(os.environ, {'MOTO_S3_CUSTOM_ENDPOINTS': 'http://minio:9000'})
+    @mock_aws
+    @patch('processing_service.utils.file_utils.get_settings')
+    @patch('processing_service.tasks.get_db')
+    def test_process_image_missing_from_storage(self, mock_get_db, mock_get_settings):
+        # Mocks
+        def mock_get_db_gen():
+            yield self.db
+        mock_get_db.return_value = mock_get_db_gen()
+        mock_get_settings.return_value = make_settings()
+        get_s3_client.cache_clear()
+        self.addCleanup(get_s3_client.cache_clear)
+        get_s3_client().create_bucket(Bucket='cards')
+
+        # Create a fake job
+        job = ProcessingJob(id=4, status='PENDING', s3_object_key='missing_key')
+        self.db.add(job)
+        self.db.commit()
+
+        # Execute the task against the stubbed bucket, which has no such key
+        with self.assertRaises(ImageProcessingError):
+            process_image_task(4, 'missing_key')
+
+        # Assertions
+        updated_job = self.db.query(ProcessingJob).filter(ProcessingJob.id == 4).first()
+        self.assertEqual(updated_job.status, 'FAILED')
+        self.assertIn('NoSuchKey', updated_job.error_message)
+
 if __name__ == '__main__':
     unittest.main()
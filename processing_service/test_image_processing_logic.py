@@ -3,12 +3,15 @@ import numpy as np
 from PIL import Image
 import io
 import cv2
+from unittest.mock import patch
 
 from processing_service.core.image_processing import (
     preprocess_image,
     segment_cards,
-    ocr_card,
+    binarize_card,
+    ocr_cards,
     process_image,
+    MAX_OCR_DIMENSION,
 )
 
 
@@ -32,6 +35,82 @@ class TestImageProcessingLogic(unittest.TestCase):
         card_texts = process_image(image_bytes)
         self.assertEqual(len(card_texts), 0)
 
+    def test_binarize_card_downscales_large_cards(self):
+        card_image = np.random.randint(0, 256, (MAX_OCR_DIMENSION * 2, MAX_OCR_DIMENSION), dtype=np.uint8)
+
+        binary_image = binarize_card(card_image)
+
+        self.assertEqual(binary_image.shape, (MAX_OCR_DIMENSION, MAX_OCR_DIMENSION // 2))
+
+    @patch("processing_service.core.image_processing.pytesseract.image_to_string")
+    def test_ocr_cards_runs_tesseract_once_per_batch(self, mock_image_to_string):
+        listed_images = []
+
+        def fake_image_to_string(list_path):
+            with open(list_path) as list_file:
+                listed_images.extend(list_file.read().split())
+            return "FIRST CARD\n\fSECOND CARD\n\f"
+
+        mock_image_to_string.side_effect = fake_image_to_string
+        card_images = [np.random.randint(0, 256, (40, 30), dtype=np.uint8) for _ in range(2)]
+
+        card_texts = ocr_cards(card_images)
+
+        mock_image_to_string.assert_called_once()
+        self.assertEqual(len(listed_images), 2)
+        self.assertEqual(card_texts, ["FIRST CARD\n", "SECOND CARD\n"])
+
+    @patch("processing_service.core.image_processing.pytesseract.image_to_string")
+    def test_ocr_cards_skips_images_without_text(self, mock_image_to_string):
+        blank_card = np.full((40, 30), 255, dtype=np.uint8)
+        tiny_card = np.random.randint(0, 256, (8, 8), dtype=np.uint8)
+
+        card_texts = ocr_cards([blank_card, tiny_card])
+
+        mock_image_to_string.assert_not_called()
+        self.assertEqual(card_texts, ["", ""])
+
+    @patch("processing_service.core.image_processing.pytesseract.image_to_string")
+    def test_ocr_cards_recognises_identical_cards_once(self, mock_image_to_string):
+        listed_images = []
+
+        def fake_image_to_string(list_path):
+            with open(list_path) as list_file:
+                listed_images.extend(list_file.read().split())
+            return "SAME CARD\n\f"
+
+        mock_image_to_string.side_effect = fake_image_to_string
+        card_image = np.random.randint(0, 256, (40, 30), dtype=np.uint8)
+
+        card_texts = ocr_cards([card_image, card_image.copy()])
+
+        self.assertEqual(len(listed_images), 1)
+        self.assertEqual(card_texts, ["SAME CARD\n", "SAME CARD\n"])
+
+    @patch("processing_service.core.image_processing.pytesseract.image_to_string")
+    def test_ocr_cards_rejects_missing_pages(self, mock_image_to_string):
+        mock_image_to_string.return_value = "ONLY CARD\n"
+        card_images = [np.random.randint(0, 256, (40, 30), dtype=np.uint8) for _ in range(2)]
+
+        with self.assertRaises(RuntimeError):
+            ocr_cards(card_images)
+
+    @patch("processing_service.core.image_processing.OCR_BATCH_SIZE", 2)
+    @patch("processing_service.core.image_processing.pytesseract.image_to_string")
+    def test_ocr_cards_splits_full_batches_across_workers(self, mock_image_to_string):
+        def fake_image_to_string(list_path):
+            with open(list_path) as list_file:
+                image_count = len(list_file.read().split())
+            return "".join(f"CARD {image_count}\n\f" for _ in range(image_count))
+
+        mock_image_to_string.side_effect = fake_image_to_string
+        card_images = [np.random.randint(0, 256, (40, 30), dtype=np.uint8) for _ in range(5)]
+
+        card_texts = ocr_cards(card_images)
+
+        self.assertEqual(mock_image_to_string.call_count, 3)
+        self.assertEqual(sorted(card_texts), ["CARD 1\n"] + ["CARD 2\n"] * 4)
+
 
 if __name__ == "__main__":
     unittest.main()
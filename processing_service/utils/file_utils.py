@@ -1,47 +1,44 @@
 import boto3
-import requests
 import hashlib
+from functools import lru_cache
 from shared.shared.models.models import ProcessedImage
 from shared.config import get_settings
 
-settings = get_settings()
-
-def download_image_from_s3(image_key: str) -> bytes:
+@lru_cache(maxsize=1)
+def get_s3_client():
     """
-    Downloads an image from S3 and returns its content as bytes.
+    Returns the S3 client shared by every download in this process, so the
+    client and its connection pool are only created once.
     """
-    s3 = boto3.client(
+    settings = get_settings()
+    return boto3.client(
         "s3",
-        endpoint_url=settings.MINIO_ENDPOINT,
-        aws_access_key_id=settings.MINIO_ACCESS_KEY,
-        aws_secret_access_key=settings.MINIO_SECRET_KEY,
-        region_name=settings.S3_REGION,
+        endpoint_url=settings.minio_endpoint,
+        aws_access_key_id=settings.minio_access_key,
+        aws_secret_access_key=settings.minio_secret_key,
+        region_name=settings.s3_region,
     )
-    try:
-        response = s3.get_object(Bucket=settings.S3_BUCKET_NAME, Key=image_key)
-        return response["Body"].read()
-    except Exception as e:
-        print(f"Error downloading image from S3: {e}")
-        return b""
 
-def download_image(url: str) -> bytes:
+def download_image_from_s3(image_key: str) -> bytes:
     """
-    Downloads an image from a URL and returns its content as bytes.
+    Downloads an image from S3 and returns its content as bytes.
+    Raises botocore's ClientError or BotoCoreError if the object cannot be fetched.
     """
-    try:
-        response = requests.get(url)
-        response.raise_for_status()  # Raise an exception for bad status codes
-        return response.content
-    except requests.exceptions.RequestException as e:
-        print(f"Error downloading image from {url}: {e}")
-        return b""
+    s3 = get_s3_client()
+    response = s3.get_object(Bucket=get_settings().s3_bucket_name, Key=image_key)
+    return response["Body"].read()
 
+from sqlalchemy import exists
 from sqlalchemy.orm import Session
 
-def is_image_processed(image_bytes: bytes, db: Session) -> bool:
+def get_image_hash(image_bytes: bytes) -> str:
+    """
+    Returns the hash used to recognise an image that was processed before.
+    """
+    return hashlib.sha256(image_bytes).hexdigest()
+
+def is_image_processed(image_hash: str, db: Session) -> bool:
     """
     Checks if an image has been processed before based on its hash.
     """
-    image_hash = hashlib.sha256(image_bytes).hexdigest()
-    processed_image = db.query(ProcessedImage).filter(ProcessedImage.hash == image_hash).first()
-    return processed_image is not None
+    return db.query(exists().where(ProcessedImage.hash == image_hash)).scalar()
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -17,9 +19,12 @@ class Settings(BaseSettings):
     secret_key: str = "a_very_secret_key"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    denoise_method: str = "nlm"
+    denoise_scale: float = 1.0
 
     class Config:
         env_file = ".env"
 
+@lru_cache
 def get_settings():
     return Settings()